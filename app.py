@@ -1,94 +1,234 @@
-from flask import Flask, request, jsonify, send_file
-from pydantic import BaseModel, Field, validator
-from typing import Literal, Tuple
+from flask import Flask, Response, request, jsonify
+from pydantic import BaseModel, Field, field_validator
+from typing import TYPE_CHECKING, Callable, Literal, Optional, Tuple
+import hashlib
+import json
 import re
 import os
-import zipfile
+import string
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
 from io import BytesIO
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
+from functools import lru_cache
 from datetime import datetime
 import os
+from zipstream import ZipStream, ZIP_STORED
+
+if TYPE_CHECKING:
+    from reportlab.pdfgen.canvas import Canvas
 
 app = Flask(__name__)
 
+# Number of processes used to render documents; 0 renders in the request thread.
+PDF_WORKERS = int(os.environ.get("PDF_WORKERS", 0))
+PDF_RENDER_TIMEOUT = 10
+_pdf_pool = None
+_pdf_pool_lock = threading.Lock()
+
+# Recent submissions whose documents are kept, so a retried or refreshed form
+# is served without rendering again.
+DOCUMENT_CACHE_SIZE = int(os.environ.get("DOCUMENT_CACHE_SIZE", 1024))
+
+# Seconds browsers and CDNs may reuse the form page and schema without revalidating.
+STATIC_MAX_AGE = int(os.environ.get("STATIC_MAX_AGE", 3600))
+
+COMPANY_NAME_RE = re.compile(r'^[a-zA-Z0-9\s,\.\'&]+$')
+
+# Runs of characters replaced when a company name is used in a filename.
+_FILENAME_UNSAFE_RE = re.compile(r'[^A-Za-z0-9]+')
+
+# ASCII bytes COMPANY_NAME_RE accepts. Deleting them with bytes.translate checks a
+# typical name in one C pass; anything left over is settled by the regex.
+_COMPANY_NAME_BYTES = (string.ascii_letters + string.digits + " \t\n\r\x0b\x0c,.'&").encode('ascii')
+
+US_STATES = frozenset((
+    'AL', 'AK', 'AZ', 'AR', 'CA', 'CO', 'CT', 'DE', 'FL', 'GA',
+    'HI', 'ID', 'IL', 'IN', 'IA', 'KS', 'KY', 'LA', 'ME', 'MD',
+    'MA', 'MI', 'MN', 'MS', 'MO', 'MT', 'NE', 'NV', 'NH', 'NJ',
+    'NM', 'NY', 'NC', 'ND', 'OH', 'OK', 'OR', 'PA', 'RI', 'SC',
+    'SD', 'TN', 'TX', 'UT', 'VT', 'VA', 'WA', 'WV', 'WI', 'WY',
+    'DC', 'PR', 'GU', 'VI', 'AS', 'MP'
+))
+
+def _state_index(code: str) -> int:
+    """Map a two-letter upper-case code onto 0..675"""
+    return (ord(code[0]) - 65) * 26 + ord(code[1]) - 65
+
+# One bit per valid code, so validation is a shift and a mask instead of a hash lookup.
+_STATE_MASK = sum(1 << _state_index(state) for state in US_STATES)
+
+# <option> elements for the state dropdown, rendered once at import.
+STATE_OPTIONS_HTML = "".join(f'<option value="{s}">{s}</option>' for s in sorted(US_STATES))
+
+def _safe_filename(company_name: str) -> str:
+    """Reduce a company name to a filename-safe stem for the generated files"""
+    return _FILENAME_UNSAFE_RE.sub('_', company_name).strip('_') or 'company'
+
 class CompanyFormation(BaseModel):
     company_name: str = Field(..., description="Company name")
     state_of_formation: str = Field(..., description="US state or territory")
     company_type: Literal["corporation", "LLC"] = Field(..., description="Type of company")
     incorporator_name: str = Field(..., description="Name of incorporator")
 
-    @validator('company_name')
-    def validate_company_name(cls, v):
-        if not re.match(r'^[a-zA-Z0-9\s,\.\'&]+$', v):
+    @field_validator('company_name')
+    @classmethod
+    def validate_company_name(cls, v: str) -> str:
+        if v and v.isascii() and not v.encode('ascii').translate(None, _COMPANY_NAME_BYTES):
+            return v
+        if not COMPANY_NAME_RE.match(v):
             raise ValueError('Company name can only contain alphanumeric characters, spaces, commas, periods, apostrophes, and ampersands')
         return v
 
-    @validator('state_of_formation')
-    def validate_state(cls, v):
-        states = {
-            'AL', 'AK', 'AZ', 'AR', 'CA', 'CO', 'CT', 'DE', 'FL', 'GA',
-            'HI', 'ID', 'IL', 'IN', 'IA', 'KS', 'KY', 'LA', 'ME', 'MD',
-            'MA', 'MI', 'MN', 'MS', 'MO', 'MT', 'NE', 'NV', 'NH', 'NJ',
-            'NM', 'NY', 'NC', 'ND', 'OH', 'OK', 'OR', 'PA', 'RI', 'SC',
-            'SD', 'TN', 'TX', 'UT', 'VT', 'VA', 'WA', 'WV', 'WI', 'WY',
-            'DC', 'PR', 'GU', 'VI', 'AS', 'MP'
-        }
-        if v.upper() not in states:
+    @field_validator('state_of_formation')
+    @classmethod
+    def validate_state(cls, v: str) -> str:
+        code = v.upper()
+        if not (len(code) == 2 and code.isascii() and code.isalpha() and _STATE_MASK >> _state_index(code) & 1):
             raise ValueError('Invalid US state or territory')
-        return v.upper()
+        return code
 
-def generate_delaware_articles(company_data: CompanyFormation) -> Tuple[BytesIO, str]:
-    """Generate PDF and text versions of Delaware articles of incorporation
+# Pre-rendered PDF templates carry fixed-width placeholders for the names, so a
+# name that fits can be spliced in without shifting any xref offsets.
+PDF_FIELD_WIDTH = 80
+_COMPANY_NAME_FIELD = "{{COMPANY_NAME}}".ljust(PDF_FIELD_WIDTH, "~")
+_INCORPORATOR_NAME_FIELD = "{{INCORPORATOR_NAME}}".ljust(PDF_FIELD_WIDTH, "~")
+
+# Printable ASCII minus the characters escapePDF rewrites: (, ) and backslash.
+_PDF_PLAIN_TEXT_RE = re.compile(r'[\x20-\x27\x2a-\x5b\x5d-\x7e]*')
+
+@lru_cache(maxsize=None)
+def _warn_if_rl_accel_missing() -> None:
+    # reportlab quietly falls back to pure Python text output without rl_accel
+    from reportlab.lib.rl_accel import _c_funcs
+    if 'fp_str' not in _c_funcs:
+        app.logger.warning("reportlab C accelerator (rl_accel) is not installed; PDF rendering will be slower")
+
+def _draw_pdf(draw: Callable, company_name: str, incorporator_name: str, day: str, month_year: str) -> bytes:
+    """Render a PDF document with the given drawing function
     
     Args:
-        company_data: Company formation data
+        draw: Function that draws the document onto a canvas
+        company_name: Company name to draw
+        incorporator_name: Incorporator name to draw
+        day: Day of the month the document is executed
+        month_year: Month and year the document is executed
         
     Returns:
-        Tuple containing PDF buffer and text content
+        The complete PDF bytes
     """
-    # Generate PDF
+    # reportlab is imported on first render so processes that only serve the
+    # form and schema never load it
+    from reportlab.pdfgen.canvas import Canvas
+    from reportlab.lib.pagesizes import letter
+    _warn_if_rl_accel_missing()
+    
     buffer = BytesIO()
-    c = canvas.Canvas(buffer, pagesize=letter)
+    # Content streams stay uncompressed: zlib costs more than it saves on a
+    # one-page certificate, and template fields can only be patched in plain text.
+    # invariant=1 pins the document ID and timestamps, so identical input always
+    # renders identical bytes.
+    c = Canvas(buffer, pagesize=letter, pageCompression=0, invariant=1)
+    draw(c, company_name, incorporator_name, day, month_year)
+    c.save()
+    return buffer.getvalue()
+
+@lru_cache(maxsize=16)
+def _pdf_template(draw: Callable, day: str, month_year: str) -> Tuple[bytes, int, int]:
+    """Render a document with placeholder names and locate the placeholders
+    
+    Returns:
+        Tuple containing the template bytes and the company and incorporator name offsets
+    """
+    template = _draw_pdf(draw, _COMPANY_NAME_FIELD, _INCORPORATOR_NAME_FIELD, day, month_year)
+    return (
+        template,
+        template.index(_COMPANY_NAME_FIELD.encode('ascii')),
+        template.index(_INCORPORATOR_NAME_FIELD.encode('ascii')),
+    )
+
+def _fits_pdf_field(value: str) -> bool:
+    return len(value) <= PDF_FIELD_WIDTH and _PDF_PLAIN_TEXT_RE.fullmatch(value) is not None
+
+def _execution_date() -> Tuple[str, str]:
+    """Return the day of the month and the "Month, Year" a document is executed on"""
+    now = datetime.now()
+    return now.strftime('%d'), now.strftime('%B, %Y')
+
+def _render_pdf(draw: Callable, company_data: CompanyFormation, day: str, month_year: str) -> BytesIO:
+    """Render a PDF document, filling in a cached template when the names allow it
     
+    Args:
+        draw: Function that draws the document onto a canvas
+        company_data: Company formation data
+        day: Day of the month the document is executed
+        month_year: Month and year the document is executed
+        
+    Returns:
+        PDF buffer positioned at the start
+    """
+    company_name = company_data.company_name
+    incorporator_name = company_data.incorporator_name
+    
+    # Names that are too long or that reportlab would escape change the byte
+    # length of the document, so those still get a full render.
+    if not (_fits_pdf_field(company_name) and _fits_pdf_field(incorporator_name)):
+        return BytesIO(_draw_pdf(draw, company_name, incorporator_name, day, month_year))
+    
+    template, company_offset, incorporator_offset = _pdf_template(draw, day, month_year)
+    pdf = bytearray(template)
+    pdf[company_offset:company_offset + PDF_FIELD_WIDTH] = company_name.ljust(PDF_FIELD_WIDTH).encode('ascii')
+    pdf[incorporator_offset:incorporator_offset + PDF_FIELD_WIDTH] = incorporator_name.ljust(PDF_FIELD_WIDTH).encode('ascii')
+    return BytesIO(pdf)
+
+def _draw_lines(c: "Canvas", lines: Tuple[Tuple[int, int, str], ...]) -> None:
+    """Draw (x, y, text) lines in 12pt Helvetica as a single text object
+    
+    One BT/ET block for the whole body keeps the content stream smaller than
+    a drawString call per line, which opens and closes a text object each time.
+    """
+    text = c.beginText()
+    text.setFont("Helvetica", 12)
+    for x, y, line in lines:
+        text.setTextOrigin(x, y)
+        text.textOut(line)
+    c.drawText(text)
+
+def _draw_delaware_articles(c: "Canvas", company_name: str, incorporator_name: str, day: str, month_year: str) -> None:
     # Set up the document
     c.setFont("Helvetica-Bold", 16)
     c.drawCentredString(300, 750, "CERTIFICATE OF INCORPORATION")
-    c.setFont("Helvetica", 12)
-    
-    # Article First - Company Name
-    c.drawString(50, 700, "FIRST: The name of this corporation is:")
-    c.drawString(70, 680, company_data.company_name)
-    
-    # Article Second - Registered Office
-    c.drawString(50, 630, "SECOND: Its registered office in the State of Delaware is located at:")
-    c.drawString(70, 610, "251 Little Falls Drive, Wilmington, New Castle County, Delaware 19808")
-    
-    # Article Third - Purpose
-    c.drawString(50, 560, "THIRD: The purpose of the corporation is to engage in any lawful act or activity for")
-    c.drawString(50, 540, "which corporations may be organized under the General Corporation Law of Delaware.")
-    
-    # Article Fourth - Authorized Shares
-    c.drawString(50, 490, "FOURTH: The total number of shares of stock which this corporation is authorized")
-    c.drawString(50, 470, "to issue is 1,000 shares of Common Stock with $0.01 par value per share.")
-    
-    # Incorporator
-    c.drawString(50, 200, f"IN WITNESS WHEREOF, the undersigned, being the incorporator hereinbefore named,")
-    c.drawString(50, 180, f"has executed this Certificate of Incorporation this {datetime.now().strftime('%d')} day of")
-    c.drawString(50, 160, f"{datetime.now().strftime('%B, %Y')}.")
-    
-    c.drawString(50, 100, "Incorporator:")
-    c.drawString(70, 80, company_data.incorporator_name)
-    
-    c.save()
-    buffer.seek(0)
     
-    # Generate text version
-    today = datetime.now().strftime("%d %B, %Y")
-    text_content = f"""CERTIFICATE OF INCORPORATION
+    _draw_lines(c, (
+        # Article First - Company Name
+        (50, 700, "FIRST: The name of this corporation is:"),
+        (70, 680, company_name),
+        
+        # Article Second - Registered Office
+        (50, 630, "SECOND: Its registered office in the State of Delaware is located at:"),
+        (70, 610, "251 Little Falls Drive, Wilmington, New Castle County, Delaware 19808"),
+        
+        # Article Third - Purpose
+        (50, 560, "THIRD: The purpose of the corporation is to engage in any lawful act or activity for"),
+        (50, 540, "which corporations may be organized under the General Corporation Law of Delaware."),
+        
+        # Article Fourth - Authorized Shares
+        (50, 490, "FOURTH: The total number of shares of stock which this corporation is authorized"),
+        (50, 470, "to issue is 1,000 shares of Common Stock with $0.01 par value per share."),
+        
+        # Incorporator
+        (50, 200, f"IN WITNESS WHEREOF, the undersigned, being the incorporator hereinbefore named,"),
+        (50, 180, f"has executed this Certificate of Incorporation this {day} day of"),
+        (50, 160, f"{month_year}."),
+        
+        (50, 100, "Incorporator:"),
+        (70, 80, incorporator_name),
+    ))
+
+_DE_CORP_TEXT = """CERTIFICATE OF INCORPORATION
 
 FIRST: The name of this corporation is:
-{company_data.company_name}
+{company_name}
 
 SECOND: Its registered office in the State of Delaware is located at:
 251 Little Falls Drive, Wilmington, New Castle County, Delaware 19808
@@ -103,61 +243,67 @@ IN WITNESS WHEREOF, the undersigned, being the incorporator hereinbefore named,
 has executed this Certificate of Incorporation this {today}.
 
 Incorporator:
-{company_data.incorporator_name}"""
-    
-    return buffer, text_content
+{incorporator_name}"""
 
-def generate_delaware_llc_certificate(company_data: CompanyFormation) -> Tuple[BytesIO, str]:
-    """Generate PDF and text versions of Delaware LLC certificate of formation
+def generate_delaware_articles(company_data: CompanyFormation, execution_date: Optional[Tuple[str, str]] = None) -> Tuple[BytesIO, str]:
+    """Generate PDF and text versions of Delaware articles of incorporation
     
     Args:
         company_data: Company formation data
+        execution_date: Day and "Month, Year" to date the documents; defaults to today
         
     Returns:
         Tuple containing PDF buffer and text content
     """
+    day, month_year = execution_date or _execution_date()
+    
     # Generate PDF
-    buffer = BytesIO()
-    c = canvas.Canvas(buffer, pagesize=letter)
+    buffer = _render_pdf(_draw_delaware_articles, company_data, day, month_year)
     
+    # Generate text version
+    text_content = _DE_CORP_TEXT.format(
+        company_name=company_data.company_name,
+        today=f"{day} {month_year}",
+        incorporator_name=company_data.incorporator_name,
+    )
+    
+    return buffer, text_content
+
+def _draw_delaware_llc_certificate(c: "Canvas", company_name: str, incorporator_name: str, day: str, month_year: str) -> None:
     # Set up the document
     c.setFont("Helvetica-Bold", 16)
     c.drawCentredString(300, 750, "CERTIFICATE OF FORMATION")
-    c.setFont("Helvetica", 12)
-    
-    # Article First - Company Name
-    c.drawString(50, 700, "FIRST: The name of the limited liability company is:")
-    c.drawString(70, 680, company_data.company_name)
     
-    # Article Second - Registered Office
-    c.drawString(50, 630, "SECOND: The address of its registered office in the State of Delaware is:")
-    c.drawString(70, 610, "251 Little Falls Drive, Wilmington, New Castle County, Delaware 19808")
-    
-    # Article Third - Registered Agent
-    c.drawString(50, 560, "THIRD: The name and address of its registered agent in the State of Delaware is:")
-    c.drawString(70, 540, "Corporation Service Company")
-    c.drawString(70, 520, "251 Little Falls Drive")
-    c.drawString(70, 500, "Wilmington, DE 19808")
-    
-    # Article Fourth - Management
-    c.drawString(50, 450, "FOURTH: The limited liability company shall be managed by its members.")
-    
-    # Execution
-    c.drawString(50, 200, f"IN WITNESS WHEREOF, the undersigned has executed this Certificate of Formation this {datetime.now().strftime('%d')} day of")
-    c.drawString(50, 180, f"{datetime.now().strftime('%B, %Y')}.")
-    
-    c.drawString(50, 100, "Authorized Person:")
-    c.drawString(70, 80, company_data.incorporator_name)
-    
-    c.save()
-    buffer.seek(0)
-    
-    # Generate text version
-    today = datetime.now().strftime("%d %B, %Y")
-    text_content = f"""CERTIFICATE OF FORMATION
+    _draw_lines(c, (
+        # Article First - Company Name
+        (50, 700, "FIRST: The name of the limited liability company is:"),
+        (70, 680, company_name),
+        
+        # Article Second - Registered Office
+        (50, 630, "SECOND: The address of its registered office in the State of Delaware is:"),
+        (70, 610, "251 Little Falls Drive, Wilmington, New Castle County, Delaware 19808"),
+        
+        # Article Third - Registered Agent
+        (50, 560, "THIRD: The name and address of its registered agent in the State of Delaware is:"),
+        (70, 540, "Corporation Service Company"),
+        (70, 520, "251 Little Falls Drive"),
+        (70, 500, "Wilmington, DE 19808"),
+        
+        # Article Fourth - Management
+        (50, 450, "FOURTH: The limited liability company shall be managed by its members."),
+        
+        # Execution
+        (50, 200, f"IN WITNESS WHEREOF, the undersigned has executed this Certificate of Formation this {day} day of"),
+        (50, 180, f"{month_year}."),
+        
+        (50, 100, "Authorized Person:"),
+        (70, 80, incorporator_name),
+    ))
+
+_DE_LLC_TEXT = """CERTIFICATE OF FORMATION
 
 FIRST: The name of the limited liability company is:
-{company_data.company_name}
+{company_name}
 
 SECOND: The address of its registered office in the State of Delaware is:
 251 Little Falls Drive, Wilmington, New Castle County, Delaware 19808
@@ -172,77 +318,206 @@ FOURTH: The limited liability company shall be managed by its members.
 IN WITNESS WHEREOF, the undersigned has executed this Certificate of Formation this {today}.
 
 Authorized Person:
-{company_data.incorporator_name}"""
+{incorporator_name}"""
+
+def generate_delaware_llc_certificate(company_data: CompanyFormation, execution_date: Optional[Tuple[str, str]] = None) -> Tuple[BytesIO, str]:
+    """Generate PDF and text versions of Delaware LLC certificate of formation
+    
+    Args:
+        company_data: Company formation data
+        execution_date: Day and "Month, Year" to date the documents; defaults to today
+        
+    Returns:
+        Tuple containing PDF buffer and text content
+    """
+    day, month_year = execution_date or _execution_date()
+    
+    # Generate PDF
+    buffer = _render_pdf(_draw_delaware_llc_certificate, company_data, day, month_year)
+    
+    # Generate text version
+    text_content = _DE_LLC_TEXT.format(
+        company_name=company_data.company_name,
+        today=f"{day} {month_year}",
+        incorporator_name=company_data.incorporator_name,
+    )
     
     return buffer, text_content
 
-def generate_california_articles(company_data: CompanyFormation) -> BytesIO:
-    buffer = BytesIO()
-    c = canvas.Canvas(buffer, pagesize=letter)
-    
+def _draw_california_articles(c: "Canvas", company_name: str, incorporator_name: str, day: str, month_year: str) -> None:
     # Set up the document
     c.setFont("Helvetica-Bold", 16)
     c.drawCentredString(300, 750, "ARTICLES OF INCORPORATION")
-    c.setFont("Helvetica", 12)
-    
-    # Article I - Company Name
-    c.drawString(50, 700, "ARTICLE I: The name of this corporation is:")
-    c.drawString(70, 680, company_data.company_name)
-    
-    # Article II - Purpose
-    c.drawString(50, 630, "ARTICLE II: The purpose of the corporation is to engage in any lawful act or activity")
-    c.drawString(50, 610, "for which a corporation may be organized under the General Corporation Law of California.")
-    
-    # Article III - Agent for Service
-    c.drawString(50, 560, "ARTICLE III: The name and address in California of the corporation's initial agent for service of process is:")
-    c.drawString(70, 540, "California Registered Agent, Inc.")
-    c.drawString(70, 520, "123 Main Street")
-    c.drawString(70, 500, "Los Angeles, CA 90001")
     
-    # Incorporator
-    c.drawString(50, 200, f"IN WITNESS WHEREOF, the undersigned, being the incorporator hereinbefore named,")
-    c.drawString(50, 180, f"has executed these Articles of Incorporation this {datetime.now().strftime('%d')} day of")
-    c.drawString(50, 160, f"{datetime.now().strftime('%B, %Y')}.")
-    
-    c.drawString(50, 100, "Incorporator:")
-    c.drawString(70, 80, company_data.incorporator_name)
-    
-    c.save()
-    buffer.seek(0)
-    return buffer
+    _draw_lines(c, (
+        # Article I - Company Name
+        (50, 700, "ARTICLE I: The name of this corporation is:"),
+        (70, 680, company_name),
+        
+        # Article II - Purpose
+        (50, 630, "ARTICLE II: The purpose of the corporation is to engage in any lawful act or activity"),
+        (50, 610, "for which a corporation may be organized under the General Corporation Law of California."),
+        
+        # Article III - Agent for Service
+        (50, 560, "ARTICLE III: The name and address in California of the corporation's initial agent for service of process is:"),
+        (70, 540, "California Registered Agent, Inc."),
+        (70, 520, "123 Main Street"),
+        (70, 500, "Los Angeles, CA 90001"),
+        
+        # Incorporator
+        (50, 200, f"IN WITNESS WHEREOF, the undersigned, being the incorporator hereinbefore named,"),
+        (50, 180, f"has executed these Articles of Incorporation this {day} day of"),
+        (50, 160, f"{month_year}."),
+        
+        (50, 100, "Incorporator:"),
+        (70, 80, incorporator_name),
+    ))
 
-def generate_california_llc_certificate(company_data: CompanyFormation) -> BytesIO:
-    buffer = BytesIO()
-    c = canvas.Canvas(buffer, pagesize=letter)
-    
+def generate_california_articles(company_data: CompanyFormation, execution_date: Optional[Tuple[str, str]] = None) -> BytesIO:
+    day, month_year = execution_date or _execution_date()
+    return _render_pdf(_draw_california_articles, company_data, day, month_year)
+
+def _draw_california_llc_certificate(c: "Canvas", company_name: str, incorporator_name: str, day: str, month_year: str) -> None:
     # Set up the document
     c.setFont("Helvetica-Bold", 16)
     c.drawCentredString(300, 750, "ARTICLES OF ORGANIZATION")
-    c.setFont("Helvetica", 12)
-    
-    # Article I - Company Name
-    c.drawString(50, 700, "ARTICLE I: The name of the limited liability company is:")
-    c.drawString(70, 680, company_data.company_name)
     
-    # Article II - Purpose
-    c.drawString(50, 630, "ARTICLE II: The purpose of the limited liability company is to engage in any lawful business.")
+    _draw_lines(c, (
+        # Article I - Company Name
+        (50, 700, "ARTICLE I: The name of the limited liability company is:"),
+        (70, 680, company_name),
+        
+        # Article II - Purpose
+        (50, 630, "ARTICLE II: The purpose of the limited liability company is to engage in any lawful business."),
+        
+        # Article III - Agent for Service
+        (50, 560, "ARTICLE III: The name and address in California of the LLC's initial agent for service of process is:"),
+        (70, 540, "California Registered Agent, Inc."),
+        (70, 520, "123 Main Street"),
+        (70, 500, "Los Angeles, CA 90001"),
+        
+        # Execution
+        (50, 200, f"IN WITNESS WHEREOF, the undersigned has executed these Articles of Organization this {day} day of"),
+        (50, 180, f"{month_year}."),
+        
+        (50, 100, "Authorized Person:"),
+        (70, 80, incorporator_name),
+    ))
+
+def generate_california_llc_certificate(company_data: CompanyFormation, execution_date: Optional[Tuple[str, str]] = None) -> BytesIO:
+    day, month_year = execution_date or _execution_date()
+    return _render_pdf(_draw_california_llc_certificate, company_data, day, month_year)
+
+def _static_response(body: bytes, mimetype: str, etag: str) -> Response:
+    """Build a cacheable response for a precomputed body, answering 304 when the ETag matches
     
-    # Article III - Agent for Service
-    c.drawString(50, 560, "ARTICLE III: The name and address in California of the LLC's initial agent for service of process is:")
-    c.drawString(70, 540, "California Registered Agent, Inc.")
-    c.drawString(70, 520, "123 Main Street")
-    c.drawString(70, 500, "Los Angeles, CA 90001")
+    Args:
+        body: Encoded response body
+        mimetype: Content type of the body
+        etag: Strong ETag for the body
+        
+    Returns:
+        The response, made conditional on the current request
+    """
+    response = Response(body, mimetype=mimetype)
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = STATIC_MAX_AGE
+    return response.make_conditional(request)
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    """Return this process's PDF rendering pool, starting it on first use
     
-    # Execution
-    c.drawString(50, 200, f"IN WITNESS WHEREOF, the undersigned has executed these Articles of Organization this {datetime.now().strftime('%d')} day of")
-    c.drawString(50, 180, f"{datetime.now().strftime('%B, %Y')}.")
+    The pool is created lazily so a server that forks workers after importing
+    the app gives each worker its own pool instead of sharing a broken one.
+    """
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            _pdf_pool = ProcessPoolExecutor(max_workers=PDF_WORKERS)
+        return _pdf_pool
+
+def _discard_pdf_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken or stuck pool and stop its processes so the next render starts a fresh one"""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is pool:
+            _pdf_pool = None
+    # shutdown() neither stops running calls nor keeps its process table, and
+    # there is no public way to kill workers, so take the processes first.
+    processes = list((pool._processes or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+
+def _run_generator(generate: Callable, company_data: CompanyFormation, execution_date: Tuple[str, str]):
+    """Run a document generator, in the PDF pool when one is configured
     
-    c.drawString(50, 100, "Authorized Person:")
-    c.drawString(70, 80, company_data.incorporator_name)
+    Args:
+        generate: Document generator to run
+        company_data: Company formation data
+        execution_date: Day and "Month, Year" to date the documents
+        
+    Returns:
+        Whatever the generator returns
+    """
+    if not PDF_WORKERS:
+        return generate(company_data, execution_date)
+    
+    # A child that dies (OOM kill, segfault) breaks the whole pool, so replace
+    # it and retry once before giving up.
+    for attempt in range(2):
+        pool = _get_pdf_pool()
+        try:
+            future = pool.submit(generate, company_data, execution_date)
+        except BrokenProcessPool:
+            _discard_pdf_pool(pool)
+            if attempt:
+                raise
+            continue
+        try:
+            return future.result(timeout=PDF_RENDER_TIMEOUT)
+        except FuturesTimeoutError:
+            # A render that has started cannot be cancelled, and a hung one would
+            # hold its process forever, so replace the whole pool.
+            _discard_pdf_pool(pool)
+            raise
+        except BrokenProcessPool:
+            _discard_pdf_pool(pool)
+            if attempt:
+                raise
+
+# Document generators for each supported (state, company type)
+_DOCUMENT_GENERATORS = {
+    ('DE', 'corporation'): generate_delaware_articles,
+    ('DE', 'LLC'): generate_delaware_llc_certificate,
+}
+
+@lru_cache(maxsize=DOCUMENT_CACHE_SIZE)
+def _build_documents(state_of_formation: str, company_type: str, company_name: str, incorporator_name: str, day: str, month_year: str) -> Tuple[bytes, str]:
+    """Generate the PDF and text documents for a submission, memoized on everything that goes into them
     
-    c.save()
-    buffer.seek(0)
-    return buffer
+    Args:
+        state_of_formation: Validated state code
+        company_type: Type of company
+        company_name: Validated company name
+        incorporator_name: Name of incorporator
+        day: Day of the month the documents are executed
+        month_year: Month and year the documents are executed
+        
+    Returns:
+        Tuple containing PDF bytes and text content
+    """
+    # The fields were validated by the caller, so skip validating them again
+    company_data = CompanyFormation.model_construct(
+        company_name=company_name,
+        state_of_formation=state_of_formation,
+        company_type=company_type,
+        incorporator_name=incorporator_name,
+    )
+    generate = _DOCUMENT_GENERATORS[(state_of_formation, company_type)]
+    pdf_buffer, text_content = _run_generator(generate, company_data, (day, month_year))
+    return pdf_buffer.getvalue(), text_content
 
 @app.route('/form-company', methods=['POST'])
 def form_company():
@@ -254,97 +529,94 @@ def form_company():
     try:
         # Handle both JSON and form data
         if request.is_json:
-            data = request.get_json()
+            data = request.get_json(silent=True)
+            if not isinstance(data, dict):
+                return jsonify({"error": "Request body must be a JSON object"}), 400
         else:
+            form = request.form
             data = {
-                "company_name": request.form.get("company_name"),
-                "state_of_formation": request.form.get("state_of_formation"),
-                "company_type": request.form.get("company_type"),
-                "incorporator_name": request.form.get("incorporator_name")
+                field: form.get(field)
+                for field in ("company_name", "state_of_formation", "company_type", "incorporator_name")
             }
         
         company_data = CompanyFormation(**data)
         
         if company_data.state_of_formation == 'DE':
-            if company_data.company_type == 'corporation':
-                pdf_buffer, text_content = generate_delaware_articles(company_data)
-            elif company_data.company_type == 'LLC':
-                pdf_buffer, text_content = generate_delaware_llc_certificate(company_data)
-            else:
-                return jsonify({"error": "Unsupported company type"}), 400
+            # Read the date once so the cache key and the documents always agree on it
+            day, month_year = _execution_date()
+            pdf_bytes, text_content = _build_documents(
+                company_data.state_of_formation,
+                company_data.company_type,
+                company_data.company_name,
+                company_data.incorporator_name,
+                day,
+                month_year,
+            )
             
-            # Create a zip file containing both PDF and TXT files
-            zip_buffer = BytesIO()
-            with zipfile.ZipFile(zip_buffer, 'w') as zf:
-                # Add PDF file
-                zf.writestr(f"{company_data.company_name}_certificate.pdf", pdf_buffer.getvalue())
-                
-                # Add TXT file
-                zf.writestr(f"{company_data.company_name}_certificate.txt", text_content)
+            safe_name = _safe_filename(company_data.company_name)
             
-            zip_buffer.seek(0)
-            return send_file(
-                zip_buffer,
-                mimetype='application/zip',
-                as_attachment=True,
-                download_name=f"{company_data.company_name}_formation_documents.zip"
+            # Stream a zip containing both PDF and TXT files. The entries are stored
+            # uncompressed: the documents are a few KB, so DEFLATE would cost more CPU
+            # than it saves, and stored entries let the archive size be known up front.
+            zs = ZipStream(compress_type=ZIP_STORED, sized=True)
+            zs.add(pdf_bytes, f"{safe_name}_certificate.pdf")
+            zs.add(text_content.encode('utf-8'), f"{safe_name}_certificate.txt")
+            
+            response = Response(zs, mimetype='application/zip')
+            response.headers['Content-Length'] = str(len(zs))
+            response.headers.set(
+                'Content-Disposition', 'attachment',
+                filename=f"{safe_name}_formation_documents.zip"
             )
+            return response
         else:
             return jsonify({
                 "error": "Only Delaware and California entities are supported at this time"
             }), 400
-    
-        return send_file(
-            pdf_buffer,
-            mimetype='application/pdf',
-            as_attachment=True,
-            download_name=f"{company_data.company_name}_certificate.pdf"
-        )
+    except FuturesTimeoutError:
+        return jsonify({"error": "Timed out generating formation documents"}), 504
+    except BrokenProcessPool:
+        return jsonify({"error": "Document rendering is temporarily unavailable"}), 503
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
+SCHEMA_EXAMPLES = [
+    {
+        "company_name": "Acme Corp, Inc.",
+        "state_of_formation": "DE",
+        "company_type": "corporation",
+        "incorporator_name": "John Smith"
+    },
+    {
+        "company_name": "Smith & Sons, LLC",
+        "state_of_formation": "DE",
+        "company_type": "LLC",
+        "incorporator_name": "Jane Doe"
+    },
+    {
+        "company_name": "Tech Innovators Co.",
+        "state_of_formation": "CA",
+        "company_type": "corporation",
+        "incorporator_name": "Michael Johnson"
+    },
+    {
+        "company_name": "California Dreaming, LLC",
+        "state_of_formation": "CA",
+        "company_type": "LLC",
+        "incorporator_name": "Emily Chen"
+    }
+]
+
+# Serialized once; the examples are static so every request gets the same bytes.
+_SCHEMA_JSON = json.dumps(SCHEMA_EXAMPLES).encode('utf-8')
+_SCHEMA_ETAG = hashlib.sha1(_SCHEMA_JSON).hexdigest()
+
 @app.route('/form-company-schema', methods=['GET'])
 def form_company_schema():
-    examples = [
-        {
-            "company_name": "Acme Corp, Inc.",
-            "state_of_formation": "DE",
-            "company_type": "corporation",
-            "incorporator_name": "John Smith"
-        },
-        {
-            "company_name": "Smith & Sons, LLC",
-            "state_of_formation": "DE",
-            "company_type": "LLC",
-            "incorporator_name": "Jane Doe"
-        },
-        {
-            "company_name": "Tech Innovators Co.",
-            "state_of_formation": "CA",
-            "company_type": "corporation",
-            "incorporator_name": "Michael Johnson"
-        },
-        {
-            "company_name": "California Dreaming, LLC",
-            "state_of_formation": "CA",
-            "company_type": "LLC",
-            "incorporator_name": "Emily Chen"
-        }
-    ]
-    return jsonify(examples)
+    return _static_response(_SCHEMA_JSON, 'application/json', _SCHEMA_ETAG)
 
-@app.route('/', methods=['GET'])
-def company_form():
-    states = [
-        'AL', 'AK', 'AZ', 'AR', 'CA', 'CO', 'CT', 'DE', 'FL', 'GA',
-        'HI', 'ID', 'IL', 'IN', 'IA', 'KS', 'KY', 'LA', 'ME', 'MD',
-        'MA', 'MI', 'MN', 'MS', 'MO', 'MT', 'NE', 'NV', 'NH', 'NJ',
-        'NM', 'NY', 'NC', 'ND', 'OH', 'OK', 'OR', 'PA', 'RI', 'SC',
-        'SD', 'TN', 'TX', 'UT', 'VT', 'VA', 'WA', 'WV', 'WI', 'WY',
-        'DC', 'PR', 'GU', 'VI', 'AS', 'MP'
-    ]
-    
-    return f'''
+# The form page never changes between requests, so render and encode it once.
+_FORM_HTML = '''
     <!DOCTYPE html>
     <html>
     <head>
@@ -384,8 +656,13 @@ def company_form():
         </form>
     </body>
     </html>
-    '''
+    '''.format(state_options_html=STATE_OPTIONS_HTML).encode('utf-8')
+_FORM_ETAG = hashlib.sha1(_FORM_HTML).hexdigest()
+
+@app.route('/', methods=['GET'])
+def company_form():
+    return _static_response(_FORM_HTML, 'text/html', _FORM_ETAG)
 
 if __name__ == '__main__':
     port = int(os.environ.get("PORT", 8080))
-    app.run(debug=True, port=port)
+    app.run(debug=os.environ.get("FLASK_DEBUG") == "1", port=port)
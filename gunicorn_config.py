@@ -0,0 +1,15 @@
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 8080)}"
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "gthread"
+threads = 4
+timeout = 30
+
+# Import the app once in the master so every worker is forked with it loaded
+preload_app = True
+
+def on_starting(server):
+    # app.py imports reportlab lazily; load it here so forked workers share it
+    import reportlab.pdfgen.canvas  # noqa: F401
@@ -1,8 +1,15 @@
 import pytest
-from app import CompanyFormation, generate_delaware_articles, generate_california_articles, generate_california_llc_certificate
+import app as app_module
+from app import app, CompanyFormation, generate_delaware_articles, generate_california_articles, generate_california_llc_certificate
+from app import PDF_FIELD_WIDTH, STATIC_MAX_AGE, _draw_delaware_articles, _draw_pdf, _execution_date, _render_pdf
 from pydantic import ValidationError
 from PyPDF2 import PdfReader
 import io
+import multiprocessing
+import os
+import time
+import zipfile
+from concurrent.futures.process import BrokenProcessPool
 
 # Test data
 VALID_STATES = [
@@ -102,3 +109,241 @@ def test_california_llc_pdf():
     assert "ARTICLE I: The name of the limited liability company is:" in text
     assert "ARTICLE II: The purpose of the limited liability company" in text
     assert "ARTICLE III: The name and address in California" in text
+
+def test_company_form_lists_states():
+    client = app.test_client()
+    response = client.get('/')
+    
+    assert response.status_code == 200
+    html = response.get_data(as_text=True)
+    for state in VALID_STATES:
+        assert f'<option value="{state}">{state}</option>' in html
+
+def test_company_form_not_modified():
+    client = app.test_client()
+    response = client.get('/')
+    assert response.headers['Content-Type'] == 'text/html; charset=utf-8'
+    assert response.headers['Cache-Control'] == f"public, max-age={STATIC_MAX_AGE}"
+    etag = response.headers['ETag']
+    
+    response = client.get('/', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+
+def test_form_company_schema_caching():
+    client = app.test_client()
+    response = client.get('/form-company-schema')
+    
+    assert response.status_code == 200
+    assert response.headers['Content-Type'] == 'application/json'
+    assert response.get_json()[0]["company_name"] == "Acme Corp, Inc."
+    assert response.headers['Cache-Control'] == f"public, max-age={STATIC_MAX_AGE}"
+    etag = response.headers['ETag']
+    
+    response = client.get('/form-company-schema', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    
+    response = client.get('/form-company-schema', headers={'If-None-Match': '"stale"'})
+    assert response.status_code == 200
+
+def test_pdf_generation_without_template():
+    # Names that reportlab escapes or that overflow the template field take the full render path
+    test_data = {
+        "company_name": "A Very Long Company Name " * 5,
+        "state_of_formation": "CA",
+        "company_type": "corporation",
+        "incorporator_name": "Testy (Jr.) McTestface"
+    }
+    
+    pdf_buffer = generate_california_articles(CompanyFormation(**test_data))
+    pdf_buffer.seek(0)
+    
+    reader = PdfReader(pdf_buffer)
+    text = "\n".join(page.extract_text() for page in reader.pages)
+    
+    assert "A Very Long Company Name" in text
+    assert "Testy (Jr.) McTestface" in text
+
+def test_form_company_rejects_malformed_json():
+    client = app.test_client()
+    response = client.post('/form-company', data='{"company_name": ', content_type='application/json')
+    
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "Request body must be a JSON object"}
+
+def test_state_validation_rejects_malformed_codes():
+    for state in ["", "D", "DEL", "1A", "@@", "D "]:
+        with pytest.raises(ValidationError):
+            data = {
+                "company_name": "Test Company",
+                "state_of_formation": state,
+                "company_type": "corporation",
+                "incorporator_name": "Test User"
+            }
+            CompanyFormation(**data)
+
+def test_company_name_validation():
+    for name in ["Acme Corp, Inc.", "Smith & Sons", "O'Reilly Media"]:
+        data = {
+            "company_name": name,
+            "state_of_formation": "DE",
+            "company_type": "corporation",
+            "incorporator_name": "Test User"
+        }
+        assert CompanyFormation(**data).company_name == name
+
+    for name in ["", "Acme <Corp>", "Acme (Holdings)", "Café Corp"]:
+        with pytest.raises(ValidationError):
+            data = {
+                "company_name": name,
+                "state_of_formation": "DE",
+                "company_type": "corporation",
+                "incorporator_name": "Test User"
+            }
+            CompanyFormation(**data)
+
+def test_form_company_returns_zip():
+    test_data = {
+        "company_name": "Zip Test LLC",
+        "state_of_formation": "DE",
+        "company_type": "LLC",
+        "incorporator_name": "Testy McTestface"
+    }
+    
+    client = app.test_client()
+    response = client.post('/form-company', json=test_data)
+    
+    assert response.status_code == 200
+    assert response.mimetype == 'application/zip'
+    assert int(response.headers['Content-Length']) == len(response.data)
+    
+    with zipfile.ZipFile(io.BytesIO(response.data)) as zf:
+        text = zf.read("Zip_Test_LLC_certificate.txt").decode('utf-8')
+        reader = PdfReader(io.BytesIO(zf.read("Zip_Test_LLC_certificate.pdf")))
+    
+    assert "CERTIFICATE OF FORMATION" in text
+    assert "Zip Test LLC" in reader.pages[0].extract_text()
+
+def test_pdf_template_matches_full_render():
+    # Filling a cached template must produce exactly what a fresh render would
+    company_data = CompanyFormation(**{
+        "company_name": "Template Test Corp",
+        "state_of_formation": "DE",
+        "company_type": "corporation",
+        "incorporator_name": "Testy McTestface"
+    })
+    day, month_year = _execution_date()
+    
+    filled = _render_pdf(_draw_delaware_articles, company_data, day, month_year).getvalue()
+    rendered = _draw_pdf(
+        _draw_delaware_articles,
+        company_data.company_name.ljust(PDF_FIELD_WIDTH),
+        company_data.incorporator_name.ljust(PDF_FIELD_WIDTH),
+        day,
+        month_year,
+    )
+    
+    assert filled == rendered
+
+@pytest.fixture
+def pdf_pool(monkeypatch):
+    # Render in a single-process pool; documents are not memoized across tests
+    monkeypatch.setattr(app_module, "PDF_WORKERS", 1)
+    app_module._build_documents.cache_clear()
+    yield
+    if app_module._pdf_pool is not None:
+        app_module._discard_pdf_pool(app_module._pdf_pool)
+    app_module._build_documents.cache_clear()
+
+POOL_TEST_DATA = {
+    "company_name": "Pool Test Corp",
+    "state_of_formation": "DE",
+    "company_type": "corporation",
+    "incorporator_name": "Testy McTestface"
+}
+
+def test_form_company_with_pdf_pool(pdf_pool):
+    client = app.test_client()
+    response = client.post('/form-company', json=POOL_TEST_DATA)
+    
+    assert response.status_code == 200
+    assert app_module._pdf_pool is not None
+
+def test_form_company_recovers_from_broken_pdf_pool(pdf_pool):
+    # Kill the only child so the pool is broken before the request arrives
+    with pytest.raises(BrokenProcessPool):
+        app_module._get_pdf_pool().submit(os._exit, 1).result()
+    
+    client = app.test_client()
+    for _ in range(2):
+        app_module._build_documents.cache_clear()
+        response = client.post('/form-company', json=POOL_TEST_DATA)
+        assert response.status_code == 200
+
+def test_form_company_pdf_pool_timeout(pdf_pool, monkeypatch):
+    monkeypatch.setattr(app_module, "PDF_RENDER_TIMEOUT", 0)
+    
+    client = app.test_client()
+    response = client.post('/form-company', json=POOL_TEST_DATA)
+    
+    assert response.status_code == 504
+    assert response.get_json() == {"error": "Timed out generating formation documents"}
+
+def test_form_company_memoizes_documents():
+    test_data = {
+        "company_name": "Cache Test Corp",
+        "state_of_formation": "DE",
+        "company_type": "corporation",
+        "incorporator_name": "Testy McTestface"
+    }
+    app_module._build_documents.cache_clear()
+    
+    client = app.test_client()
+    documents = []
+    for _ in range(2):
+        response = client.post('/form-company', json=test_data)
+        assert response.status_code == 200
+        with zipfile.ZipFile(io.BytesIO(response.data)) as zf:
+            documents.append([zf.read(name) for name in zf.namelist()])
+    
+    cache_info = app_module._build_documents.cache_info()
+    assert (cache_info.misses, cache_info.hits) == (1, 1)
+    assert documents[0] == documents[1]
+
+def test_form_company_sanitizes_filenames():
+    test_data = {
+        "company_name": "Smith & Sons, Inc.",
+        "state_of_formation": "DE",
+        "company_type": "LLC",
+        "incorporator_name": "Testy McTestface"
+    }
+    client = app.test_client()
+    response = client.post('/form-company', json=test_data)
+    
+    assert response.headers['Content-Disposition'] == "attachment; filename=Smith_Sons_Inc_formation_documents.zip"
+    with zipfile.ZipFile(io.BytesIO(response.data)) as zf:
+        assert zf.namelist() == ["Smith_Sons_Inc_certificate.pdf", "Smith_Sons_Inc_certificate.txt"]
+
+def _hanging_generator(company_data, execution_date):
+    time.sleep(60)
+
+def test_form_company_replaces_pool_after_hung_render(pdf_pool, monkeypatch):
+    monkeypatch.setattr(app_module, "PDF_RENDER_TIMEOUT", 1)
+    generator_key = ('DE', 'corporation')
+    generate = app_module._DOCUMENT_GENERATORS[generator_key]
+    monkeypatch.setitem(app_module._DOCUMENT_GENERATORS, generator_key, _hanging_generator)
+    
+    client = app.test_client()
+    response = client.post('/form-company', json=POOL_TEST_DATA)
+    assert response.status_code == 504
+    
+    # The hung pool is gone, and its process is stopped rather than left running
+    assert app_module._pdf_pool is None
+    deadline = time.monotonic() + 5
+    while multiprocessing.active_children() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert multiprocessing.active_children() == []
+    
+    # The next request gets a fresh pool instead of queueing behind the hung render
+    app_module._DOCUMENT_GENERATORS[generator_key] = generate
+    response = client.post('/form-company', json=POOL_TEST_DATA)
+    assert response.status_code == 200